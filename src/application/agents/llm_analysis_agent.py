@@ -7,9 +7,11 @@ using natural language understanding and advanced reasoning capabilities.
 import os
 import json
 import asyncio
+import orjson
 from typing import List, Dict, Any, Optional
 from langchain.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI
 
 from .llm_base_agent import BaseLLMAgent, LLMAgentTask, LLMAgentResult, LLMTaskType
 from ..tools.base_tool import BaseTool, ToolResult, ToolStatus
@@ -18,6 +20,10 @@ from ..tools.vector_storage import VectorStorage
 from ...infrastructure.database.unified_repository import UnifiedDatabaseRepository
 
 
+# Tags batch jobs created by this app so that only those are served back
+SENTIMENT_BATCH_METADATA = {"created_by": "ai_invest_analysis_agent"}
+
+
 class MockOpenAIAnalysisTool(BaseTool):
     """Mock OpenAI analysis tool for demo purposes."""
     
@@ -88,7 +94,7 @@ class MockReportGeneratorTool(BaseTool):
             "title": f"Mock {report_type.title()} Report",
             "content": f"This is a mock {report_type} report generated for demonstration purposes. It would contain comprehensive financial analysis based on the provided data.",
             "generated_at": "2025-08-29T10:00:00Z",
-            "data_points": len(str(data))
+            "data_points": len(data) if isinstance(data, (dict, list)) else 0
         }
         
         return ToolResult(
@@ -179,10 +185,12 @@ class LLMAnalysisAgent(BaseLLMAgent):
             tools.append(MockSlackNotificationTool())
         
         # Use different LLM model for analysis
+        self.analysis_model = os.getenv("OPENAI_MODEL_ANALYSIS", "gpt-4o")
         if llm is None:
             analysis_llm = ChatOpenAI(
-                model=os.getenv("OPENAI_MODEL_ANALYSIS", "gpt-4o"),
+                model=self.analysis_model,
                 temperature=0.1,
+                timeout=float(os.getenv("OPENAI_REQUEST_TIMEOUT", "60")),
                 api_key=os.getenv("OPENAI_API_KEY")
             )
         else:
@@ -200,6 +208,7 @@ class LLMAnalysisAgent(BaseLLMAgent):
         self.repository = repository
         self.confidence_threshold = confidence_threshold
         self.enable_notifications = enable_notifications
+        self._openai_client: Optional[AsyncOpenAI] = None
     
     def _create_agent_prompt(self) -> ChatPromptTemplate:
         """Create the AnalysisAgent's specialized prompt."""
@@ -340,4 +349,99 @@ Agent scratchpad: {agent_scratchpad}""")
                 "batch_processing": True
             }
         )
-        return await self.execute_task(task)
\ No newline at end of file
+        return await self.execute_task(task)
+    
+    # OpenAI Batch API operations
+    
+    def _get_openai_client(self) -> AsyncOpenAI:
+        """Get the OpenAI client used for batch jobs."""
+        if self._openai_client is None:
+            self._openai_client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                timeout=float(os.getenv("OPENAI_REQUEST_TIMEOUT", "60"))
+            )
+        return self._openai_client
+    
+    async def submit_sentiment_batch(
+        self,
+        contents: Dict[str, str],
+        analysis_depth: str = "comprehensive"
+    ) -> str:
+        """
+        Submit sentiment analysis of many contents as an OpenAI batch job.
+        
+        Args:
+            contents: Mapping of custom ID (e.g. article ID) to content
+            analysis_depth: Depth of the sentiment analysis
+            
+        Returns:
+            ID of the created batch, to be polled with get_batch_results
+        """
+        lines = []
+        for custom_id, content in contents.items():
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.analysis_model,
+                    "temperature": 0.1,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are AnalysisAgent, an expert AI financial analyst specialized in content analysis and market insights."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Perform {analysis_depth} sentiment analysis on the following financial content, including confidence scoring and contextual insights.\n\n{content}"
+                        }
+                    ]
+                }
+            }))
+        
+        client = self._get_openai_client()
+        batch_file = await client.files.create(
+            file=("sentiment_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata=SENTIMENT_BATCH_METADATA
+        )
+        return batch.id
+    
+    async def get_batch_results(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of a batch job and its results once completed.
+        
+        Returns None for batches not submitted by submit_sentiment_batch, so
+        other jobs in the OpenAI account are never exposed.
+        """
+        client = self._get_openai_client()
+        batch = await client.batches.retrieve(batch_id)
+        
+        metadata = batch.metadata or {}
+        if any(metadata.get(key) != value for key, value in SENTIMENT_BATCH_METADATA.items()):
+            return None
+        
+        result = {
+            "batch_id": batch.id,
+            "status": batch.status,
+            "request_counts": batch.request_counts.model_dump() if batch.request_counts else None,
+            "results": None
+        }
+        
+        if batch.status == "completed" and batch.output_file_id:
+            output = await client.files.content(batch.output_file_id)
+            results = {}
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                choices = ((record.get("response") or {}).get("body") or {}).get("choices") or []
+                results[record["custom_id"]] = choices[0]["message"]["content"] if choices else None
+            result["results"] = results
+        
+        return result
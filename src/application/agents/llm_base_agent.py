@@ -229,6 +229,7 @@ class BaseLLMAgent(ABC):
             self.llm = ChatOpenAI(
                 model=os.getenv("OPENAI_MODEL_AGENT", "gpt-4o-mini"),
                 temperature=0.1,
+                timeout=float(os.getenv("OPENAI_REQUEST_TIMEOUT", "60")),
                 api_key=os.getenv("OPENAI_API_KEY")
             )
         else:
@@ -16,11 +16,17 @@ class MarketDataFetcher(BaseTool):
     """Real market data fetcher using yfinance."""
     
     # Common stock symbols for reference
-    POPULAR_SYMBOLS = [
+    POPULAR_SYMBOLS = (
         "AAPL", "GOOGL", "MSFT", "AMZN", "TSLA", "META", "NVDA", "NFLX",
         "AMD", "INTC", "CRM", "ORCL", "IBM", "V", "MA", "JPM", "BAC",
         "SPY", "QQQ", "DIA", "IWM"  # ETFs
-    ]
+    )
+    
+    # S&P 500, Dow Jones, NASDAQ, Russell 2000, VIX
+    MAJOR_INDICES = ("^GSPC", "^DJI", "^IXIC", "^RUT", "^VIX")
+    
+    # Placeholder trending list until a trending API is integrated
+    TRENDING_SYMBOLS = ("AAPL", "GOOGL", "MSFT", "TSLA", "NVDA", "META", "AMZN")
     
     def __init__(self, cache_timeout: int = 300):  # 5 minutes cache
         super().__init__(
@@ -74,8 +80,8 @@ class MarketDataFetcher(BaseTool):
                     error_message="No symbols provided"
                 )
             
-            # Clean and validate symbols
-            symbols = [symbol.upper().strip() for symbol in symbols if symbol.strip()]
+            # Clean, validate and deduplicate symbols, keeping their order
+            symbols = list(dict.fromkeys(symbol.upper().strip() for symbol in symbols if symbol.strip()))
             symbols = symbols[:20]  # Limit to 20 symbols to avoid rate limits
             
             self.logger.info(f"Fetching current prices for {len(symbols)} symbols")
@@ -146,55 +152,95 @@ class MarketDataFetcher(BaseTool):
     
     async def _fetch_batch_prices(self, symbols: List[str]) -> Dict[str, Any]:
         """Fetch prices for a batch of symbols."""
-        batch_data = {}
+        # Run in thread pool to avoid blocking: one batched history download,
+        # with company info fetched concurrently per symbol
+        loop = asyncio.get_running_loop()
+        history_future = loop.run_in_executor(None, self._download_batch_history, symbols)
+        infos = await asyncio.gather(
+            *(loop.run_in_executor(None, self._fetch_symbol_info, symbol) for symbol in symbols),
+            return_exceptions=True
+        )
         
-        def fetch_data():
-            results = {}
-            for symbol in symbols:
-                try:
-                    ticker = yf.Ticker(symbol)
-                    info = ticker.info
-                    history = ticker.history(period="1d")
-                    
-                    if not history.empty:
-                        current_price = history['Close'].iloc[-1]
-                        prev_close = info.get('previousClose', history['Close'].iloc[-1])
-                        
-                        results[symbol] = {
-                            "symbol": symbol,
-                            "price": float(current_price),
-                            "previous_close": float(prev_close),
-                            "change": float(current_price - prev_close),
-                            "change_percent": float((current_price - prev_close) / prev_close * 100) if prev_close else 0,
-                            "volume": int(history['Volume'].iloc[-1]) if not history['Volume'].empty else 0,
-                            "high": float(history['High'].iloc[-1]) if not history['High'].empty else float(current_price),
-                            "low": float(history['Low'].iloc[-1]) if not history['Low'].empty else float(current_price),
-                            "market_cap": info.get('marketCap'),
-                            "pe_ratio": info.get('trailingPE'),
-                            "company_name": info.get('longName', info.get('shortName', symbol)),
-                            "currency": info.get('currency', 'USD')
-                        }
-                    else:
-                        # Fallback to basic info
-                        results[symbol] = {
-                            "symbol": symbol,
-                            "price": info.get('currentPrice', info.get('regularMarketPrice')),
-                            "previous_close": info.get('previousClose'),
-                            "error": "No historical data available"
-                        }
-                        
-                except Exception as e:
-                    self.logger.warning(f"Failed to fetch data for {symbol}: {str(e)}")
-                    results[symbol] = {
-                        "symbol": symbol,
-                        "error": str(e)
-                    }
-            
-            return results
+        try:
+            histories = await history_future
+        except Exception as e:
+            self.logger.warning(f"Failed to download price history for {symbols}: {str(e)}")
+            histories = {}
+        
+        return {
+            symbol: self._build_price_data(symbol, info, histories.get(symbol))
+            for symbol, info in zip(symbols, infos)
+        }
+    
+    def _download_batch_history(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Download today's price history for all symbols in one request (blocking)."""
+        data = yf.download(
+            tickers=symbols,
+            period="1d",
+            interval="1d",
+            group_by="ticker",
+            threads=True,
+            progress=False
+        )
         
-        # Run in thread pool to avoid blocking
-        batch_data = await asyncio.get_event_loop().run_in_executor(None, fetch_data)
-        return batch_data
+        if data.empty:
+            return {}
+        if not isinstance(data.columns, pd.MultiIndex):
+            return {symbols[0]: data}
+        
+        return {
+            symbol: data[symbol].dropna(how="all")
+            for symbol in data.columns.get_level_values(0).unique()
+        }
+    
+    def _fetch_symbol_info(self, symbol: str) -> Dict[str, Any]:
+        """Fetch company info for a single symbol (blocking)."""
+        return yf.Ticker(symbol).info
+    
+    def _build_price_data(
+        self,
+        symbol: str,
+        info: Union[Dict[str, Any], Exception],
+        history: Optional[pd.DataFrame]
+    ) -> Dict[str, Any]:
+        """Combine company info and price history into a symbol's price data."""
+        try:
+            if isinstance(info, Exception):
+                raise info
+            
+            if history is not None and not history.empty:
+                current_price = history['Close'].iloc[-1]
+                prev_close = info.get('previousClose', history['Close'].iloc[-1])
+                
+                return {
+                    "symbol": symbol,
+                    "price": float(current_price),
+                    "previous_close": float(prev_close),
+                    "change": float(current_price - prev_close),
+                    "change_percent": float((current_price - prev_close) / prev_close * 100) if prev_close else 0,
+                    "volume": int(history['Volume'].iloc[-1]) if not history['Volume'].empty else 0,
+                    "high": float(history['High'].iloc[-1]) if not history['High'].empty else float(current_price),
+                    "low": float(history['Low'].iloc[-1]) if not history['Low'].empty else float(current_price),
+                    "market_cap": info.get('marketCap'),
+                    "pe_ratio": info.get('trailingPE'),
+                    "company_name": info.get('longName', info.get('shortName', symbol)),
+                    "currency": info.get('currency', 'USD')
+                }
+            else:
+                # Fallback to basic info
+                return {
+                    "symbol": symbol,
+                    "price": info.get('currentPrice', info.get('regularMarketPrice')),
+                    "previous_close": info.get('previousClose'),
+                    "error": "No historical data available"
+                }
+                
+        except Exception as e:
+            self.logger.warning(f"Failed to fetch data for {symbol}: {str(e)}")
+            return {
+                "symbol": symbol,
+                "error": str(e)
+            }
     
     async def _get_historical_data(self, **kwargs) -> ToolResult:
         """Get historical stock data."""
@@ -346,9 +392,7 @@ class MarketDataFetcher(BaseTool):
     async def _get_market_summary(self) -> ToolResult:
         """Get market summary with major indices."""
         try:
-            major_indices = ["^GSPC", "^DJI", "^IXIC", "^RUT", "^VIX"]  # S&P 500, Dow Jones, NASDAQ, Russell 2000, VIX
-            
-            prices_result = await self._get_current_prices(symbols=major_indices)
+            prices_result = await self._get_current_prices(symbols=self.MAJOR_INDICES)
             
             if prices_result.is_success:
                 market_summary = {
@@ -408,9 +452,7 @@ class MarketDataFetcher(BaseTool):
         try:
             # In a real implementation, you'd use APIs like Yahoo Finance trending or similar
             # For now, return popular tech stocks as a placeholder
-            trending_symbols = ["AAPL", "GOOGL", "MSFT", "TSLA", "NVDA", "META", "AMZN"]
-            
-            prices_result = await self._get_current_prices(symbols=trending_symbols)
+            prices_result = await self._get_current_prices(symbols=self.TRENDING_SYMBOLS)
             
             if prices_result.is_success:
                 return ToolResult(
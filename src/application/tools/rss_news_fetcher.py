@@ -1,20 +1,167 @@
 """
 RSS News Fetcher Tool for AI Invest platform.
 
-Fetches financial news from RSS feeds using feedparser and newspaper3k.
+Fetches financial news from RSS feeds using lxml (with a feedparser fallback) and newspaper3k.
 """
 import os
+import time
 import asyncio
 import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from urllib.parse import urlparse, urljoin
+from email.utils import parsedate_tz, mktime_tz
+from urllib.parse import urlparse, urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
 import feedparser
-import requests
-from newspaper import Article
+import httpx
+from lxml import etree
+from lxml.html.clean import Cleaner
 import logging
 
 from .base_tool import BaseTool, ToolResult, ToolStatus
+from ...infrastructure.article_parser import parse_article_text
+
+
+# lxml parsers lock while parsing, so each feed thread keeps its own
+_feed_parser_local = threading.local()
+
+# Strips scripts, styles, event handlers and unsafe attributes, like feedparser's sanitizer
+_SUMMARY_CLEANER = Cleaner(safe_attrs_only=True, forms=True, page_structure=True)
+
+_DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+
+
+def _get_feed_xml_parser() -> etree.XMLParser:
+    """Return this thread's XML parser, which never resolves entities or touches the network."""
+    parser = getattr(_feed_parser_local, "parser", None)
+    if parser is None:
+        parser = etree.XMLParser(resolve_entities=False, no_network=True)
+        _feed_parser_local.parser = parser
+    return parser
+
+
+def _sanitize_summary(description: str) -> str:
+    """Sanitize description HTML before it reaches storage and LLM prompts."""
+    if "<" not in description:
+        return description
+    try:
+        return _SUMMARY_CLEANER.clean_html(description)
+    except Exception:
+        return ""
+
+
+def _parse_feed_entries(content: bytes) -> list:
+    """
+    Parse feed entries, reading RSS 2.0 items directly with lxml.
+    
+    Entries are returned as feedparser.FeedParserDict objects with the fields
+    used by RSSNewsFetcher. Atom and malformed feeds fall back to feedparser.
+    """
+    try:
+        root = etree.fromstring(content, parser=_get_feed_xml_parser())
+    except etree.XMLSyntaxError:
+        return feedparser.parse(content).entries
+    
+    items = root.findall("./channel/item") if root.tag == "rss" else []
+    if not items:
+        return feedparser.parse(content).entries
+    
+    entries = []
+    for item in items:
+        entry = feedparser.FeedParserDict(
+            link=(item.findtext("link") or "").strip(),
+            title=item.findtext("title") or "",
+            summary=_sanitize_summary(item.findtext("description") or ""),
+            author=item.findtext("author") or item.findtext(_DC_CREATOR) or "",
+            id=item.findtext("guid") or ""
+        )
+        
+        categories = [category.text.strip() for category in item.findall("category") if category.text]
+        if categories:
+            entry["tags"] = [feedparser.FeedParserDict(term=category) for category in categories]
+        
+        pub_date = item.findtext("pubDate")
+        parsed_date = parsedate_tz(pub_date.strip()) if pub_date else None
+        if parsed_date:
+            # Match feedparser: published_parsed is a UTC struct_time
+            entry["published"] = pub_date.strip()
+            entry["published_parsed"] = time.gmtime(mktime_tz(parsed_date))
+        
+        entries.append(entry)
+    
+    return entries
+
+
+# Article parsing worker processes (os.cpu_count() reports host CPUs in containers)
+ARTICLE_PARSE_WORKERS = int(os.getenv("ARTICLE_PARSE_WORKERS", "2"))
+
+_HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+# Worker pools and HTTP client shared by all fetcher instances, created on first use
+_feed_executor: Optional[ThreadPoolExecutor] = None
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_http_client: Optional[httpx.AsyncClient] = None
+_executor_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP/2 client, keeping connections alive across fetches."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            headers=_HTTP_HEADERS,
+            limits=httpx.Limits(
+                max_connections=RSSNewsFetcher.MAX_CONCURRENT_DOWNLOADS,
+                max_keepalive_connections=RSSNewsFetcher.MAX_KEEPALIVE_CONNECTIONS
+            ),
+            follow_redirects=True
+        )
+    return _http_client
+
+
+def _get_feed_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool used for RSS feed parsing."""
+    global _feed_executor
+    with _executor_lock:
+        if _feed_executor is None:
+            _feed_executor = ThreadPoolExecutor(
+                max_workers=RSSNewsFetcher.MAX_CONCURRENT_FEEDS, thread_name_prefix="rss_feed"
+            )
+        return _feed_executor
+
+
+def _get_parse_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool used for article parsing."""
+    global _parse_executor
+    with _executor_lock:
+        if _parse_executor is None:
+            # Spawn workers instead of forking the (threaded) server process
+            _parse_executor = ProcessPoolExecutor(
+                max_workers=ARTICLE_PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_executor
+
+
+async def shutdown_executors() -> None:
+    """Close the shared HTTP client and shut down the worker pools (called on application shutdown)."""
+    global _feed_executor, _parse_executor, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    
+    with _executor_lock:
+        if _feed_executor is not None:
+            _feed_executor.shutdown(wait=False, cancel_futures=True)
+            _feed_executor = None
+        if _parse_executor is not None:
+            _parse_executor.shutdown(wait=False, cancel_futures=True)
+            _parse_executor = None
 
 
 class RSSNewsFetcher(BaseTool):
@@ -31,6 +178,15 @@ class RSSNewsFetcher(BaseTool):
         "https://www.nasdaq.com/feed/rssoutbound?category=Stocks",
     ]
     
+    # Upper bound on simultaneous article downloads
+    MAX_CONCURRENT_DOWNLOADS = 32
+    
+    # Idle connections kept open for reuse across requests
+    MAX_KEEPALIVE_CONNECTIONS = 16
+    
+    # Worker threads for RSS feed parsing
+    MAX_CONCURRENT_FEEDS = 8
+    
     def __init__(self, timeout: int = 30, max_retries: int = 3):
         super().__init__(
             name="rss_news_fetcher", 
@@ -38,10 +194,6 @@ class RSSNewsFetcher(BaseTool):
         )
         self.timeout = timeout
         self.max_retries = max_retries
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
     
     async def execute(self, **kwargs) -> ToolResult:
         """Execute RSS news fetching."""
@@ -61,18 +213,27 @@ class RSSNewsFetcher(BaseTool):
             all_articles = []
             errors = []
             cutoff_time = datetime.now() - timedelta(hours=hours_back)
+            seen_urls = set()  # Canonical article URLs shared across feeds
             
-            for url in rss_urls:
-                try:
-                    articles = await self._fetch_from_rss(
-                        url, max_articles, cutoff_time, include_content
+            client = _get_http_client()
+            results = await asyncio.gather(
+                *(
+                    self._fetch_from_rss(
+                        url, max_articles, cutoff_time, include_content, client, seen_urls
                     )
-                    all_articles.extend(articles)
-                    self.logger.info(f"Fetched {len(articles)} articles from {url}")
-                except Exception as e:
-                    error_msg = f"Failed to fetch from {url}: {str(e)}"
+                    for url in rss_urls
+                ),
+                return_exceptions=True
+            )
+            
+            for url, result in zip(rss_urls, results):
+                if isinstance(result, Exception):
+                    error_msg = f"Failed to fetch from {url}: {str(result)}"
                     self.logger.error(error_msg)
                     errors.append(error_msg)
+                else:
+                    all_articles.extend(result)
+                    self.logger.info(f"Fetched {len(result)} articles from {url}")
             
             # Remove duplicates based on URL and content hash
             unique_articles = self._remove_duplicates(all_articles)
@@ -107,27 +268,32 @@ class RSSNewsFetcher(BaseTool):
         rss_url: str, 
         max_articles: int, 
         cutoff_time: datetime,
-        include_content: bool
+        include_content: bool,
+        client: httpx.AsyncClient,
+        seen_urls: set
     ) -> List[Dict[str, Any]]:
         """Fetch articles from a single RSS source."""
         articles = []
         
         # Parse RSS feed
         try:
-            response = self.session.get(rss_url, timeout=self.timeout)
+            response = await client.get(rss_url, timeout=self.timeout)
             response.raise_for_status()
-            feed = feedparser.parse(response.content)
+            loop = asyncio.get_running_loop()
+            entries = await loop.run_in_executor(
+                _get_feed_executor(), _parse_feed_entries, response.content
+            )
         except Exception as e:
             raise Exception(f"Failed to parse RSS feed: {str(e)}")
         
-        if not feed.entries:
+        if not entries:
             self.logger.warning(f"No entries found in RSS feed: {rss_url}")
             return articles
         
         source_domain = urlparse(rss_url).netloc
         
         # Process each entry
-        for entry in feed.entries[:max_articles * 2]:  # Fetch extra in case some are filtered
+        for entry in entries[:max_articles * 2]:  # Fetch extra in case some are filtered
             try:
                 # Parse publish date
                 published_at = self._parse_publish_date(entry)
@@ -139,6 +305,12 @@ class RSSNewsFetcher(BaseTool):
                 if not url:
                     continue
                 
+                # Skip articles already syndicated by another feed
+                canonical_url = self._canonicalize_url(url)
+                if canonical_url in seen_urls:
+                    continue
+                seen_urls.add(canonical_url)
+                
                 title = entry.get('title', '').strip()
                 summary = entry.get('summary', '').strip()
                 author = entry.get('author', '').strip()
@@ -161,16 +333,6 @@ class RSSNewsFetcher(BaseTool):
                     }
                 }
                 
-                # Extract full content if requested
-                if include_content and url:
-                    full_content = await self._extract_full_content(url)
-                    if full_content:
-                        article_data["content"] = full_content
-                
-                # Generate content hash
-                content_for_hash = article_data["content"] + title
-                article_data["content_hash"] = hashlib.md5(content_for_hash.encode()).hexdigest()
-                
                 articles.append(article_data)
                 
                 if len(articles) >= max_articles:
@@ -180,24 +342,52 @@ class RSSNewsFetcher(BaseTool):
                 self.logger.warning(f"Failed to process RSS entry: {str(e)}")
                 continue
         
+        # Download full content for all entries concurrently
+        if include_content and articles:
+            contents = await asyncio.gather(
+                *(self._extract_full_content(article["url"], client) for article in articles)
+            )
+            for article_data, full_content in zip(articles, contents):
+                if full_content:
+                    article_data["content"] = full_content
+        
+        # Generate content hashes
+        for article_data in articles:
+            content_for_hash = article_data["content"] + article_data["title"]
+            article_data["content_hash"] = hashlib.md5(content_for_hash.encode()).hexdigest()
+        
         return articles
     
-    async def _extract_full_content(self, url: str) -> Optional[str]:
+    async def _extract_full_content(self, url: str, client: httpx.AsyncClient) -> Optional[str]:
         """Extract full article content using newspaper3k."""
         try:
-            article = Article(url)
-            article.download()
-            article.parse()
+            response = await client.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(
+                _get_parse_executor(), parse_article_text, url, response.text
+            )
             
             # Return content if successfully extracted
-            if article.text and len(article.text.strip()) > 100:  # Minimum content length
-                return article.text.strip()
+            if text and len(text.strip()) > 100:  # Minimum content length
+                return text.strip()
             
         except Exception as e:
             self.logger.debug(f"Failed to extract content from {url}: {str(e)}")
         
         return None
     
+    @staticmethod
+    def _canonicalize_url(url: str) -> str:
+        """Normalize an article URL by dropping tracking parameters and fragments."""
+        parts = urlsplit(url)
+        query = urlencode([
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_")
+        ])
+        return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+    
     def _parse_publish_date(self, entry) -> Optional[datetime]:
         """Parse publish date from RSS entry."""
         # Try different date fields
@@ -7,6 +7,7 @@ multiple AI agents and execute complex financial analysis workflows.
 import asyncio
 import logging
 import uuid
+import orjson
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 from enum import Enum
@@ -26,6 +27,97 @@ from ..agents.memory_manager import EnhancedMemoryManager, MemoryType
 # Removed domain repository dependency for simplified architecture
 
 
+# Prompt for turning a user request into a workflow plan
+WORKFLOW_PLANNING_PROMPT = """You are an intelligent workflow coordinator for financial analysis tasks.
+
+Your role is to analyze user requests and create detailed execution plans using available AI agents.
+
+Available Agents:
+- DataAgent: Fetches financial news, market data, processes and stores data, creates embeddings
+- AnalysisAgent: Performs sentiment analysis, topic extraction, stock identification, report generation
+
+Agent Capabilities:
+DataAgent:
+- fetch_financial_news(sources, max_articles, keywords, store_results)
+- fetch_market_data(symbols, period, interval, include_company_info)  
+- store_data_with_vectors(data, create_embeddings)
+- assess_data_quality(data_type, days_back)
+
+AnalysisAgent:
+- analyze_sentiment(content, analysis_depth, include_confidence)
+- extract_topics(content, max_topics, include_hierarchy)
+- identify_stocks(content, include_context)
+- generate_market_report(data_sources, report_type, focus_sectors)
+- analyze_batch_content(content_list, analysis_types)
+- find_similar_content(query_content, similarity_threshold)
+
+User Request: {user_request}
+
+Additional Context: {context}
+
+Recent Relevant Context: {relevant_context}
+
+Create a detailed workflow plan with these elements:
+
+1. INTENT_ANALYSIS: What is the user trying to accomplish?
+2. WORKFLOW_STEPS: List of specific steps with:
+   - step_id: unique identifier
+   - agent: which agent to use (DataAgent or AnalysisAgent)
+   - task: natural language task description
+   - method: specific method to call (if applicable)
+   - parameters: specific parameters for the task
+   - dependencies: which previous steps this depends on
+3. SUCCESS_CRITERIA: How to determine if the workflow succeeded
+4. ESTIMATED_TIME: Expected execution time in minutes
+
+Format your response as valid JSON with these keys: intent_analysis, workflow_steps, success_criteria, estimated_time_minutes.
+
+Example workflow_steps format:
+[
+  {{
+    "step_id": "step_1",
+    "agent": "DataAgent", 
+    "task": "Fetch latest news about renewable energy companies",
+    "method": "fetch_financial_news",
+    "parameters": {{"keywords": ["renewable energy", "solar", "wind"], "max_articles": 20}},
+    "dependencies": []
+  }},
+  {{
+    "step_id": "step_2",
+    "agent": "AnalysisAgent",
+    "task": "Analyze sentiment of fetched renewable energy news",
+    "method": "analyze_batch_content", 
+    "parameters": {{"analysis_types": ["sentiment", "topics"]}},
+    "dependencies": ["step_1"]
+  }}
+]
+
+Plan the workflow now:"""
+
+# Prompt for summarizing an executed workflow
+WORKFLOW_SUMMARY_PROMPT = """You are summarizing the results of a financial analysis workflow.
+
+Workflow Details:
+- User Request: {user_request}
+- Total Steps: {total_steps}
+- Completed Steps: {completed_steps}
+- Failed Steps: {failed_steps}
+- Total Execution Time: {execution_time} seconds
+
+Step Results Summary:
+{step_results}
+
+Create a comprehensive summary with:
+1. EXECUTIVE_SUMMARY: High-level overview of what was accomplished
+2. KEY_FINDINGS: Important insights and results discovered
+3. DATA_PROCESSED: Summary of data that was fetched and analyzed
+4. SUCCESS_METRICS: Quantitative measures of workflow success
+5. RECOMMENDATIONS: Next steps or action items based on results
+6. WORKFLOW_PERFORMANCE: Analysis of execution efficiency
+
+Format as JSON with these keys: executive_summary, key_findings, data_processed, success_metrics, recommendations, workflow_performance."""
+
+
 class WorkflowStatus(Enum):
     """Workflow execution status."""
     PLANNING = "planning"
@@ -111,6 +203,18 @@ class IntelligentWorkflowCoordinator:
         else:
             self.coordinator_llm = coordinator_llm
         
+        # Build the coordinator chains once and reuse them for every workflow
+        self._planning_chain = (
+            ChatPromptTemplate.from_template(WORKFLOW_PLANNING_PROMPT)
+            | self.coordinator_llm
+            | StrOutputParser()
+        )
+        self._summary_chain = (
+            ChatPromptTemplate.from_template(WORKFLOW_SUMMARY_PROMPT)
+            | self.coordinator_llm
+            | StrOutputParser()
+        )
+        
         # Initialize agents
         self.data_agent = LLMDataAgent(repository)
         self.analysis_agent = LLMAnalysisAgent(repository)
@@ -140,7 +244,8 @@ class IntelligentWorkflowCoordinator:
         self,
         user_request: str,
         context: Optional[Dict[str, Any]] = None,
-        max_execution_time: int = 1800  # 30 minutes
+        max_execution_time: int = 1800,  # 30 minutes
+        semaphore: Optional[asyncio.Semaphore] = None
     ) -> Dict[str, Any]:
         """
         Execute a workflow based on natural language description.
@@ -149,6 +254,7 @@ class IntelligentWorkflowCoordinator:
             user_request: Natural language description of desired workflow
             context: Additional context for workflow planning
             max_execution_time: Maximum execution time in seconds
+            semaphore: Optional semaphore bounding how many steps run concurrently
             
         Returns:
             Comprehensive workflow execution results
@@ -191,10 +297,12 @@ class IntelligentWorkflowCoordinator:
             execution_results = await self._execute_workflow_steps(
                 workflow_state["steps"],
                 workflow_id,
-                max_execution_time
+                max_execution_time,
+                semaphore
             )
             
             workflow_state["results"] = execution_results
+            workflow_state["errors"].extend(execution_results["errors"])
             
             # Step 3: Generate final summary
             self.logger.info("📊 Generating workflow summary...")
@@ -260,80 +368,11 @@ class IntelligentWorkflowCoordinator:
                     f"- {mem['content']}" for mem in context_memories
                 ])
         
-        planning_prompt = ChatPromptTemplate.from_template(
-            """You are an intelligent workflow coordinator for financial analysis tasks.
-
-Your role is to analyze user requests and create detailed execution plans using available AI agents.
-
-Available Agents:
-- DataAgent: Fetches financial news, market data, processes and stores data, creates embeddings
-- AnalysisAgent: Performs sentiment analysis, topic extraction, stock identification, report generation
-
-Agent Capabilities:
-DataAgent:
-- fetch_financial_news(sources, max_articles, keywords, store_results)
-- fetch_market_data(symbols, period, interval, include_company_info)  
-- store_data_with_vectors(data, create_embeddings)
-- assess_data_quality(data_type, days_back)
-
-AnalysisAgent:
-- analyze_sentiment(content, analysis_depth, include_confidence)
-- extract_topics(content, max_topics, include_hierarchy)
-- identify_stocks(content, include_context)
-- generate_market_report(data_sources, report_type, focus_sectors)
-- analyze_batch_content(content_list, analysis_types)
-- find_similar_content(query_content, similarity_threshold)
-
-User Request: {user_request}
-
-Additional Context: {context}
-
-Recent Relevant Context: {relevant_context}
-
-Create a detailed workflow plan with these elements:
-
-1. INTENT_ANALYSIS: What is the user trying to accomplish?
-2. WORKFLOW_STEPS: List of specific steps with:
-   - step_id: unique identifier
-   - agent: which agent to use (DataAgent or AnalysisAgent)
-   - task: natural language task description
-   - method: specific method to call (if applicable)
-   - parameters: specific parameters for the task
-   - dependencies: which previous steps this depends on
-3. SUCCESS_CRITERIA: How to determine if the workflow succeeded
-4. ESTIMATED_TIME: Expected execution time in minutes
-
-Format your response as valid JSON with these keys: intent_analysis, workflow_steps, success_criteria, estimated_time_minutes.
-
-Example workflow_steps format:
-[
-  {{
-    "step_id": "step_1",
-    "agent": "DataAgent", 
-    "task": "Fetch latest news about renewable energy companies",
-    "method": "fetch_financial_news",
-    "parameters": {{"keywords": ["renewable energy", "solar", "wind"], "max_articles": 20}},
-    "dependencies": []
-  }},
-  {{
-    "step_id": "step_2",
-    "agent": "AnalysisAgent",
-    "task": "Analyze sentiment of fetched renewable energy news",
-    "method": "analyze_batch_content", 
-    "parameters": {{"analysis_types": ["sentiment", "topics"]}},
-    "dependencies": ["step_1"]
-  }}
-]
-
-Plan the workflow now:"""
-        )
         
         try:
-            planning_chain = planning_prompt | self.coordinator_llm | StrOutputParser()
-            
             plan_response = await asyncio.get_event_loop().run_in_executor(
                 None,
-                lambda: planning_chain.invoke({
+                lambda: self._planning_chain.invoke({
                     "user_request": user_request,
                     "context": str(context) if context else "None",
                     "relevant_context": relevant_context or "None"
@@ -341,8 +380,7 @@ Plan the workflow now:"""
             )
             
             # Parse JSON response
-            import json
-            workflow_plan = json.loads(plan_response.strip())
+            workflow_plan = orjson.loads(plan_response.strip())
             
             # Convert step dictionaries to WorkflowStep objects
             steps = []
@@ -374,7 +412,8 @@ Plan the workflow now:"""
         self,
         steps: List[WorkflowStep],
         workflow_id: str,
-        max_execution_time: int
+        max_execution_time: int,
+        semaphore: Optional[asyncio.Semaphore] = None
     ) -> Dict[str, Any]:
         """Execute workflow steps with dependency management."""
         
@@ -382,7 +421,8 @@ Plan the workflow now:"""
             "completed_steps": [],
             "failed_steps": [],
             "total_execution_time": 0,
-            "step_results": {}
+            "step_results": {},
+            "errors": []
         }
         
         start_time = datetime.now()
@@ -408,13 +448,13 @@ Plan the workflow now:"""
                 self.logger.error("Circular dependencies or missing dependencies detected")
                 break
             
-            # Execute ready steps (can be done in parallel)
+            # Execute ready steps (can be done in parallel, bounded by the semaphore)
             step_tasks = []
             for step in ready_steps:
-                task = self._execute_single_step(step, workflow_id)
+                task = self._execute_single_step(step, workflow_id, semaphore)
                 step_tasks.append(task)
             
-            # Wait for all parallel steps to complete
+            # Wait for all parallel steps to complete; failures are collected, not raised
             step_results = await asyncio.gather(*step_tasks, return_exceptions=True)
             
             # Process results
@@ -424,6 +464,7 @@ Plan the workflow now:"""
                 if isinstance(step_result, Exception):
                     step.status = WorkflowStatus.FAILED
                     results["failed_steps"].append(step.to_dict())
+                    results["errors"].append(f"Step {step.step_id} failed: {str(step_result)}")
                     self.logger.error(f"Step {step.step_id} failed: {str(step_result)}")
                 else:
                     step.status = WorkflowStatus.COMPLETED
@@ -444,9 +485,13 @@ Plan the workflow now:"""
     async def _execute_single_step(
         self,
         step: WorkflowStep,
-        workflow_id: str
+        workflow_id: str,
+        semaphore: Optional[asyncio.Semaphore] = None
     ) -> Optional[LLMAgentResult]:
-        """Execute a single workflow step."""
+        """Execute a single workflow step, waiting for a semaphore slot if one is given."""
+        if semaphore is not None:
+            async with semaphore:
+                return await self._execute_single_step(step, workflow_id)
         
         step.start_time = datetime.now()
         step.status = WorkflowStatus.EXECUTING
@@ -484,44 +529,17 @@ Plan the workflow now:"""
     ) -> Dict[str, Any]:
         """Generate comprehensive workflow summary using LLM."""
         
-        summary_prompt = ChatPromptTemplate.from_template(
-            """You are summarizing the results of a financial analysis workflow.
-
-Workflow Details:
-- User Request: {user_request}
-- Total Steps: {total_steps}
-- Completed Steps: {completed_steps}
-- Failed Steps: {failed_steps}
-- Total Execution Time: {execution_time} seconds
-
-Step Results Summary:
-{step_results}
-
-Create a comprehensive summary with:
-1. EXECUTIVE_SUMMARY: High-level overview of what was accomplished
-2. KEY_FINDINGS: Important insights and results discovered
-3. DATA_PROCESSED: Summary of data that was fetched and analyzed
-4. SUCCESS_METRICS: Quantitative measures of workflow success
-5. RECOMMENDATIONS: Next steps or action items based on results
-6. WORKFLOW_PERFORMANCE: Analysis of execution efficiency
-
-Format as JSON with these keys: executive_summary, key_findings, data_processed, success_metrics, recommendations, workflow_performance."""
-        )
         
         try:
             # Prepare step results summary
-            step_results_text = ""
-            for step_id, result in workflow_state.get("results", {}).get("step_results", {}).items():
-                if result and result.get("success"):
-                    step_results_text += f"- {step_id}: SUCCESS\n"
-                else:
-                    step_results_text += f"- {step_id}: FAILED\n"
-            
-            summary_chain = summary_prompt | self.coordinator_llm | StrOutputParser()
+            step_results_text = "".join(
+                f"- {step_id}: {'SUCCESS' if result and result.get('success') else 'FAILED'}\n"
+                for step_id, result in workflow_state.get("results", {}).get("step_results", {}).items()
+            )
             
             summary_response = await asyncio.get_event_loop().run_in_executor(
                 None,
-                lambda: summary_chain.invoke({
+                lambda: self._summary_chain.invoke({
                     "user_request": workflow_state["user_request"],
                     "total_steps": len(workflow_state["steps"]),
                     "completed_steps": len(workflow_state.get("results", {}).get("completed_steps", [])),
@@ -531,8 +549,7 @@ Format as JSON with these keys: executive_summary, key_findings, data_processed,
                 })
             )
             
-            import json
-            return json.loads(summary_response.strip())
+            return orjson.loads(summary_response.strip())
             
         except Exception as e:
             self.logger.error(f"Failed to generate workflow summary: {str(e)}")
@@ -0,0 +1,15 @@
+"""
+Article HTML parsing for worker processes.
+
+Kept free of application-package imports so that spawned parse workers only
+load newspaper3k, not the tools package and its heavy dependencies.
+"""
+from newspaper import Article
+
+
+def parse_article_text(url: str, html: str) -> str:
+    """Parse article text from downloaded HTML (runs in a worker process)."""
+    article = Article(url)
+    article.set_html(html)
+    article.parse()
+    return article.text or ""
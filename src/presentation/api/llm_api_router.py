@@ -4,14 +4,29 @@ Natural Language API Router for LLM-powered AI Agents.
 Provides intelligent API endpoints that understand natural language requests
 and route them to appropriate AI agents for execution.
 """
+import itertools
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query, Path
-from fastapi.responses import StreamingResponse
+import os
+import threading
+import uuid
+from types import MappingProxyType
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from pydantic import BaseModel, Field, ValidationError
+from fastapi import APIRouter, HTTPException, Depends, Query, Path, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import asyncio
-import json
+import re
+import orjson
+from cachetools import LRUCache, TTLCache
+from langchain_openai import ChatOpenAI
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    HAS_SENTENCE_TRANSFORMERS = False
 
 from ...application.agents.llm_data_agent import LLMDataAgent
 from ...application.agents.llm_analysis_agent import LLMAnalysisAgent
@@ -20,6 +35,10 @@ from ...application.use_cases.llm_intelligent_workflow import IntelligentWorkflo
 from ...infrastructure.database.connection import get_repository, create_agents
 
 
+# Agents addressable by name in path parameters
+AgentName = Literal["data", "analysis"]
+
+
 # Pydantic models for request/response schemas
 class NaturalLanguageRequest(BaseModel):
     """Request model for natural language agent tasks."""
@@ -45,8 +64,10 @@ class AgentResponse(BaseModel):
     task_id: str
     agent_name: str
     result: Any
-    reasoning_trace: List[str]
-    tools_used: List[str]
+    reasoning_trace: Optional[List[str]] = None
+    tools_used: Optional[List[str]] = None
+    trace_url: Optional[str] = None
+    tools_url: Optional[str] = None
     execution_time_ms: int
     confidence_score: Optional[float] = None
     error_message: Optional[str] = None
@@ -67,36 +88,158 @@ class WorkflowResponse(BaseModel):
     errors: List[str] = []
 
 
+def _json_body(model: type):
+    """
+    Dependency factory that validates a JSON request body from raw bytes.
+    
+    Uses pydantic-core's JSON parser directly instead of decoding the body
+    into a dict with stdlib json first.
+    """
+    async def parse_body(raw_request: Request):
+        try:
+            return model.model_validate_json(await raw_request.body())
+        except ValidationError as e:
+            # Keep FastAPI's error shape: locations are prefixed with "body"
+            raise RequestValidationError([
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ])
+    return parse_body
+
+
+def _json_body_openapi(model: type) -> Dict[str, Any]:
+    """OpenAPI request body schema for endpoints using _json_body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        }
+    }
+
+
+# Keywords used to route natural language queries to an agent, matched as whole words
+DATA_KEYWORDS = frozenset({"fetch", "get", "collect", "download", "scrape", "data", "news", "stock", "price"})
+ANALYSIS_KEYWORDS = frozenset({"analyze", "sentiment", "topics", "report", "insights", "trends", "summarize", "classify"})
+DATA_PHRASES = ("market data",)
+_WORD_PATTERN = re.compile(r"\w+")
+_DATA_PHRASE_PATTERN = re.compile(r"\b(?:" + "|".join(map(re.escape, DATA_PHRASES)) + r")\b")
+
+# Embedding-based routing: exemplar queries per agent, compared by cosine similarity
+ROUTING_EMBEDDING_MODEL = os.getenv("ROUTING_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+ROUTING_EMBEDDING_MARGIN = 0.15
+ROUTING_EXEMPLARS = {
+    "data": [
+        "Fetch the latest financial news from RSS feeds",
+        "Get Tesla stock prices for the past month",
+        "Collect market data for FAANG stocks",
+        "Download recent earnings headlines and store them",
+        "Scrape news articles about renewable energy companies"
+    ],
+    "analysis": [
+        "Analyze the market sentiment of recent tech news",
+        "Summarize the key investment themes this week",
+        "Identify arbitrage opportunities in lithium miners",
+        "Assess the risk outlook for banking stocks",
+        "Generate an investment report with recommendations"
+    ]
+}
+ROUTING_PROMPT = (
+    "Classify the following request for a financial research system. "
+    "Answer 'data' if it is mainly about fetching or collecting news or market data, "
+    "or 'analysis' if it is mainly about analyzing, interpreting or reporting. "
+    "Answer with a single word.\n\nRequest: {query}"
+)
+
+# Routing decisions cached per canonicalized query
+_route_cache: LRUCache = LRUCache(maxsize=2048)
+_routing_encoder = None
+_routing_centroids: Optional[Dict[str, Any]] = None
+_routing_encoder_lock = threading.Lock()
+_routing_encoder_failed = False  # Set once loading fails; disables the embedding tier
+_routing_warm_up_task: Optional[asyncio.Task] = None
+_routing_llm: Optional[ChatOpenAI] = None
+
+# Workflow responses whose estimated result size exceeds this are streamed
+WORKFLOW_STREAM_THRESHOLD_BYTES = 64 * 1024
+
+# Workflow completion notifications are queued (bounded) and sent in batches
+NOTIFICATION_QUEUE_SIZE = 1000
+NOTIFICATION_BATCH_SIZE = 50
+NOTIFICATION_BATCH_WINDOW_SECONDS = 0.1
+NOTIFICATION_DRAIN_TIMEOUT_SECONDS = 5.0
+
+
 # Create router
-llm_router = APIRouter(prefix="/llm", tags=["LLM Agents"])
+llm_router = APIRouter(
+    prefix="/llm",
+    tags=["LLM Agents"],
+    default_response_class=ORJSONResponse
+)
 logger = logging.getLogger("LLMAPIRouter")
 
 # Global instances (will be initialized on startup)
 data_agent: Optional[LLMDataAgent] = None
 analysis_agent: Optional[LLMAnalysisAgent] = None
 workflow_coordinator: Optional[IntelligentWorkflowCoordinator] = None
+_agents_cache: Optional[Dict[str, Any]] = None
+_init_lock = asyncio.Lock()
+
+# Shared read-only context for requests that do not provide one
+_EMPTY_CTX = MappingProxyType({})
+
+# Bounds how many workflow steps run concurrently across all requests
+_workflow_sem = asyncio.Semaphore(int(os.getenv("WORKFLOW_PARALLELISM", "8")))
+
+# Task ids combine a random per-process prefix with a monotonic counter,
+# so they stay unique across restarts and replicas
+_task_id_prefix = uuid.uuid4().hex[:12]
+_task_counter = itertools.count()
+
+# Notification queue and its consumer task (started by the application lifespan)
+_notification_queue: asyncio.Queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+_notification_consumer_task: Optional[asyncio.Task] = None
+
+# Reasoning traces and tool lists kept out of default responses, keyed by an
+# unguessable per-result token. Held in process memory, so trace URLs only
+# resolve on the worker that served the original request.
+_task_traces: TTLCache = TTLCache(maxsize=1024, ttl=600)
+
+# Full step results of workflows run from /execute, keyed by workflow_id
+_workflow_results: TTLCache = TTLCache(maxsize=256, ttl=600)
 
 
 async def get_agents():
     """Dependency to get initialized agents."""
-    global data_agent, analysis_agent, workflow_coordinator
+    global data_agent, analysis_agent, workflow_coordinator, _agents_cache
     
-    if not all([data_agent, analysis_agent, workflow_coordinator]):
-        repository = get_repository()
-        data_agent = LLMDataAgent(repository)
-        analysis_agent = LLMAnalysisAgent(repository)
-        workflow_coordinator = IntelligentWorkflowCoordinator(repository)
+    # Fast path: agents already built
+    if _agents_cache is not None:
+        return _agents_cache
     
-    return {
-        "data": data_agent,
-        "analysis": analysis_agent,
-        "workflow": workflow_coordinator
-    }
+    # Slow path: only one coroutine constructs the agents
+    async with _init_lock:
+        if _agents_cache is None:
+            repository = get_repository()
+            data_agent = LLMDataAgent(repository)
+            analysis_agent = LLMAnalysisAgent(repository)
+            workflow_coordinator = IntelligentWorkflowCoordinator(repository)
+            _agents_cache = {
+                "data": data_agent,
+                "analysis": analysis_agent,
+                "workflow": workflow_coordinator
+            }
+    
+    return _agents_cache
 
 
-@llm_router.post("/execute", response_model=AgentResponse)
+@llm_router.post(
+    "/execute",
+    response_model=AgentResponse,
+    openapi_extra=_json_body_openapi(NaturalLanguageRequest)
+)
 async def execute_natural_language_task(
-    request: NaturalLanguageRequest,
+    request: NaturalLanguageRequest = Depends(_json_body(NaturalLanguageRequest)),
+    include_trace: bool = Query(False, description="Embed reasoning trace and tools used in the response"),
     agents = Depends(get_agents)
 ):
     """
@@ -112,59 +255,22 @@ async def execute_natural_language_task(
     - "Analyze sentiment of recent tech sector news"
     """
     try:
-        # Determine which agent to use
-        if request.agent == "auto" or request.agent is None:
-            selected_agent = await _select_agent_intelligently(request.query, agents)
-        else:
-            agent_name = request.agent.lower()
-            if agent_name not in agents:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unknown agent: {request.agent}. Available: data, analysis"
-                )
-            selected_agent = agents[agent_name]
-        
-        # Create task
-        task = LLMAgentTask(
-            task_id=f"nlp_{datetime.now().timestamp()}",
-            task_type=LLMTaskType.NATURAL_LANGUAGE,
-            description=request.query,
-            context=request.context or {},
-            priority=request.priority,
-            max_iterations=15,
-            timeout_seconds=request.max_execution_time
-        )
-        
-        # Execute task
-        logger.info(f"Executing natural language task: {request.query}")
-        result = await selected_agent.execute_task(task)
-        
-        # Convert to response format
-        response = AgentResponse(
-            success=result.success,
-            task_id=result.task_id,
-            agent_name=selected_agent.name,
-            result=result.result,
-            reasoning_trace=result.reasoning_trace,
-            tools_used=result.tools_used,
-            execution_time_ms=result.execution_time_ms,
-            confidence_score=result.confidence_score,
-            error_message=result.error_message,
-            metadata=result.metadata
-        )
-        
-        logger.info(f"Task completed: {result.success}")
-        return response
+        return await _run_task(request, agents, include_trace=include_trace)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Natural language task execution failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Task execution failed: {str(e)}")
 
 
-@llm_router.post("/workflow", response_model=WorkflowResponse)
+@llm_router.post(
+    "/workflow",
+    response_model=WorkflowResponse,
+    openapi_extra=_json_body_openapi(WorkflowRequest)
+)
 async def execute_intelligent_workflow(
-    request: WorkflowRequest,
-    background_tasks: BackgroundTasks,
+    request: WorkflowRequest = Depends(_json_body(WorkflowRequest)),
     agents = Depends(get_agents)
 ):
     """
@@ -188,7 +294,8 @@ async def execute_intelligent_workflow(
         workflow_result = await workflow_coordinator.execute_natural_language_workflow(
             user_request=request.description,
             context=request.context,
-            max_execution_time=request.max_execution_time
+            max_execution_time=request.max_execution_time,
+            semaphore=_workflow_sem
         )
         
         # Convert to response format
@@ -205,14 +312,23 @@ async def execute_intelligent_workflow(
             errors=workflow_result.get("errors", [])
         )
         
-        # Add notification task if requested
+        # Queue completion notification if requested
         if request.notify_completion:
-            background_tasks.add_task(
-                _send_workflow_completion_notification,
-                workflow_result
-            )
+            try:
+                _notification_queue.put_nowait(workflow_result)
+            except asyncio.QueueFull:
+                logger.warning(f"Notification queue full, dropping notification for {workflow_result['workflow_id']}")
         
         logger.info(f"Workflow completed: {workflow_result['workflow_id']}")
+        
+        # Large multi-step results are streamed step by step instead of
+        # being rendered into a single buffer
+        if _exceeds_stream_threshold(response.results):
+            return StreamingResponse(
+                _stream_workflow_response(response),
+                media_type="application/json"
+            )
+        
         return response
         
     except Exception as e:
@@ -272,10 +388,14 @@ async def get_active_workflows(agents = Depends(get_agents)):
         raise HTTPException(status_code=500, detail=f"Failed to get active workflows: {str(e)}")
 
 
-@llm_router.post("/agent/{agent_name}/task")
+@llm_router.post(
+    "/agent/{agent_name}/task",
+    openapi_extra=_json_body_openapi(NaturalLanguageRequest)
+)
 async def execute_agent_specific_task(
-    agent_name: str = Path(..., description="Name of the agent (data or analysis)"),
-    request: NaturalLanguageRequest = ...,
+    agent_name: AgentName = Path(..., description="Name of the agent (data or analysis)"),
+    request: NaturalLanguageRequest = Depends(_json_body(NaturalLanguageRequest)),
+    include_trace: bool = Query(False, description="Embed reasoning trace and tools used in the response"),
     agents = Depends(get_agents)
 ):
     """
@@ -285,68 +405,75 @@ async def execute_agent_specific_task(
     rather than using automatic agent selection.
     """
     try:
-        agent_name = agent_name.lower()
-        if agent_name not in agents or agent_name == "workflow":
-            raise HTTPException(
-                status_code=404,
-                detail=f"Agent '{agent_name}' not found. Available: data, analysis"
-            )
-        
-        selected_agent = agents[agent_name]
-        
-        # Create and execute task
-        task = LLMAgentTask(
-            task_id=f"{agent_name}_{datetime.now().timestamp()}",
-            task_type=LLMTaskType.NATURAL_LANGUAGE,
-            description=request.query,
-            context=request.context or {},
-            priority=request.priority,
-            timeout_seconds=request.max_execution_time
-        )
+        return await _run_task(request, agents, force_agent=agent_name, include_trace=include_trace)
         
-        result = await selected_agent.execute_task(task)
-        
-        return AgentResponse(
-            success=result.success,
-            task_id=result.task_id,
-            agent_name=selected_agent.name,
-            result=result.result,
-            reasoning_trace=result.reasoning_trace,
-            tools_used=result.tools_used,
-            execution_time_ms=result.execution_time_ms,
-            confidence_score=result.confidence_score,
-            error_message=result.error_message,
-            metadata=result.metadata
-        )
-        
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Agent-specific task execution failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Task execution failed: {str(e)}")
 
 
+@llm_router.get("/workflow/{workflow_id}/results")
+async def get_workflow_results(workflow_id: str = Path(..., description="Workflow identifier")):
+    """Get the full step results of a workflow executed through /execute."""
+    results = _workflow_results.get(workflow_id)
+    if results is None:
+        raise HTTPException(status_code=404, detail=f"Results for workflow '{workflow_id}' not found or expired")
+    return {"workflow_id": workflow_id, "results": results}
+
+
+def _get_task_trace_entry(task_id: str, token: str) -> Optional[Dict[str, Any]]:
+    """Look up a cached trace entry, requiring the token issued with the task's response."""
+    entry = _task_traces.get(token)
+    if entry is None or entry["task_id"] != task_id:
+        return None
+    return entry
+
+
+@llm_router.get("/task/{task_id}/trace")
+async def get_task_trace(
+    task_id: str = Path(..., description="Task identifier"),
+    token: str = Query(..., description="Access token from the task's trace_url")
+):
+    """
+    Get the reasoning trace of a recently executed task.
+    
+    Traces are kept in process memory and only resolve on the worker that
+    executed the task.
+    """
+    entry = _get_task_trace_entry(task_id, token)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Trace for task '{task_id}' not found or expired")
+    return {"task_id": task_id, "reasoning_trace": entry["reasoning_trace"]}
+
+
+@llm_router.get("/task/{task_id}/tools")
+async def get_task_tools(
+    task_id: str = Path(..., description="Task identifier"),
+    token: str = Query(..., description="Access token from the task's tools_url")
+):
+    """
+    Get the tools used by a recently executed task.
+    
+    Tool lists are kept in process memory and only resolve on the worker that
+    executed the task.
+    """
+    entry = _get_task_trace_entry(task_id, token)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Tools for task '{task_id}' not found or expired")
+    return {"task_id": task_id, "tools_used": entry["tools_used"]}
+
+
 @llm_router.delete("/agent/{agent_name}/memory")
 async def clear_agent_memory(
-    agent_name: str = Path(..., description="Name of the agent"),
+    agent_name: AgentName = Path(..., description="Name of the agent (data or analysis)"),
     agents = Depends(get_agents)
 ):
     """Clear the memory of a specific agent."""
     try:
-        agent_name = agent_name.lower()
-        if agent_name not in agents or agent_name == "workflow":
-            raise HTTPException(
-                status_code=404,
-                detail=f"Agent '{agent_name}' not found"
-            )
-        
-        agent = agents[agent_name]
-        agent.clear_memory()
+        agents[agent_name].clear_memory()
         
         return {"message": f"Memory cleared for {agent_name} agent"}
         
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Failed to clear agent memory: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to clear memory: {str(e)}")
@@ -405,37 +532,392 @@ async def get_system_capabilities():
 
 # Helper functions
 
+async def _run_task(
+    request: NaturalLanguageRequest,
+    agents: Dict[str, Any],
+    *,
+    force_agent: Optional[str] = None,
+    include_trace: bool = False
+) -> AgentResponse:
+    """
+    Select an agent, build the task, execute it and convert the result.
+    
+    Shared by the auto-routed and agent-specific task endpoints.
+    """
+    if force_agent is not None:
+        selected_agent = agents[force_agent]
+        task_prefix = force_agent
+        max_iterations = LLMAgentTask.max_iterations
+    else:
+        # Determine which agent to use
+        if request.agent == "auto" or request.agent is None:
+            selected_agent, agent_kind = await _select_agent_intelligently(request.query, agents)
+            if agent_kind == "workflow":
+                return await _run_workflow_task(request, selected_agent)
+        else:
+            agent_name = request.agent.lower()
+            if agent_name not in agents:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown agent: {request.agent}. Available: data, analysis"
+                )
+            selected_agent = agents[agent_name]
+        task_prefix = "nlp"
+        max_iterations = 15
+    
+    # Create task
+    task = LLMAgentTask(
+        task_id=f"{task_prefix}_{_task_id_prefix}_{next(_task_counter)}",
+        task_type=LLMTaskType.NATURAL_LANGUAGE,
+        description=request.query,
+        context=request.context or _EMPTY_CTX,
+        priority=request.priority,
+        max_iterations=max_iterations,
+        timeout_seconds=request.max_execution_time
+    )
+    
+    # Execute task
+    logger.info(f"Executing natural language task: {request.query}")
+    result = await selected_agent.execute_task(task)
+    logger.info(f"Task completed: {result.success}")
+    
+    # Convert to response format
+    return _to_agent_response(result, selected_agent.name, include_trace)
+
+
+async def _run_workflow_task(
+    request: NaturalLanguageRequest,
+    workflow_coordinator: IntelligentWorkflowCoordinator
+) -> AgentResponse:
+    """
+    Execute a mixed data + analysis query through the workflow coordinator.
+    
+    Only the workflow summary is returned inline; full step results are
+    cached and exposed through a results URL.
+    """
+    logger.info(f"Executing natural language task as workflow: {request.query}")
+    workflow_result = await workflow_coordinator.execute_natural_language_workflow(
+        user_request=request.query,
+        context=request.context,
+        max_execution_time=request.max_execution_time,
+        semaphore=_workflow_sem
+    )
+    
+    workflow_id = workflow_result["workflow_id"]
+    status = workflow_result["status"].value if hasattr(workflow_result["status"], 'value') else str(workflow_result["status"])
+    results = workflow_result.get("results", {})
+    _workflow_results[workflow_id] = results
+    
+    logger.info(f"Workflow task completed: {workflow_id} ({status})")
+    return AgentResponse.model_construct(
+        success=status == "completed",
+        task_id=workflow_id,
+        agent_name="IntelligentWorkflowCoordinator",
+        result=workflow_result.get("summary"),
+        execution_time_ms=int(workflow_result.get("total_execution_time", 0) * 1000),
+        error_message=workflow_result.get("error"),
+        metadata={
+            "workflow_id": workflow_id,
+            "status": status,
+            "total_steps": len(workflow_result["steps"]),
+            "completed_steps": len(results.get("completed_steps", [])),
+            "failed_steps": len(results.get("failed_steps", [])),
+            "results_url": f"{llm_router.prefix}/workflow/{workflow_id}/results"
+        }
+    )
+
+
 async def _select_agent_intelligently(
     query: str,
     agents: Dict[str, Any]
-) -> Any:
+) -> Tuple[Any, str]:
     """
     Intelligently select the most appropriate agent for a given query.
     
-    Uses keyword analysis and LLM-based intent detection to route queries.
+    Routing is tiered from cheapest to most expensive: cached decision,
+    keyword analysis, embedding classifier (when the optional model is
+    loaded) and finally a small LLM call. Queries that need both data
+    collection and analysis are routed to the workflow coordinator.
+    
+    Returns:
+        Tuple of (agent or workflow coordinator, kind) where kind is one of
+        "data", "analysis" or "workflow"
     """
-    query_lower = query.lower()
+    cache_key = _canonicalize_query(query)
+    agent_kind = _route_cache.get(cache_key)
     
-    # Simple keyword-based routing
-    data_keywords = ["fetch", "get", "collect", "download", "scrape", "data", "news", "stock", "price", "market data"]
-    analysis_keywords = ["analyze", "sentiment", "topics", "report", "insights", "trends", "summarize", "classify"]
+    if agent_kind is None:
+        agent_kind = await _classify_query(cache_key)
+        if agent_kind:
+            _route_cache[cache_key] = agent_kind
+        else:
+            agent_kind = "analysis"  # Default to analysis for ambiguous queries
     
-    data_score = sum(1 for keyword in data_keywords if keyword in query_lower)
-    analysis_score = sum(1 for keyword in analysis_keywords if keyword in query_lower)
+    return agents[agent_kind], agent_kind
+
+
+def _canonicalize_query(query: str) -> str:
+    """Normalize case and whitespace so equivalent queries share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+async def _classify_query(query_lower: str) -> Optional[str]:
+    """Classify a canonicalized query as 'data', 'analysis' or 'workflow', or None if undecided."""
+    # Simple keyword-based routing (whole words, intersected with keyword sets)
+    words = set(_WORD_PATTERN.findall(query_lower))
+    data_score = len(words & DATA_KEYWORDS) + len(set(_DATA_PHRASE_PATTERN.findall(query_lower)))
+    analysis_score = len(words & ANALYSIS_KEYWORDS)
     
     # If query mentions both data collection and analysis, use workflow coordinator
     if data_score > 0 and analysis_score > 0:
-        # For complex queries that need both agents, we should use the workflow coordinator
-        # But since this is agent selection, we'll default to analysis agent for mixed queries
-        return agents["analysis"]
+        return "workflow"
     elif data_score > analysis_score:
-        return agents["data"]
-    else:
-        return agents["analysis"]  # Default to analysis for ambiguous queries
+        return "data"
+    elif analysis_score > 0:
+        return "analysis"
+    
+    # No keyword hits: embedding classifier, trusted only with a clear margin
+    if _routing_encoder is not None:
+        try:
+            agent_kind = await asyncio.to_thread(_classify_by_embedding, query_lower)
+            if agent_kind:
+                return agent_kind
+        except Exception as e:
+            logger.warning(f"Embedding routing failed: {str(e)}")
+    
+    # Still undecided: ask a small LLM
+    return await _classify_by_llm(query_lower)
+
+
+def _load_routing_encoder() -> None:
+    """Load the routing embedding model and exemplar centroids once."""
+    global _routing_encoder, _routing_centroids, _routing_encoder_failed
+    
+    with _routing_encoder_lock:
+        if _routing_encoder is None and not _routing_encoder_failed:
+            try:
+                encoder = SentenceTransformer(ROUTING_EMBEDDING_MODEL)
+                centroids = {}
+                for agent_kind, exemplars in ROUTING_EXEMPLARS.items():
+                    centroid = encoder.encode(exemplars, normalize_embeddings=True).mean(axis=0)
+                    centroids[agent_kind] = centroid / np.linalg.norm(centroid)
+            except Exception:
+                # Don't retry (and re-download) on every request
+                _routing_encoder_failed = True
+                raise
+            _routing_centroids = centroids
+            _routing_encoder = encoder
+
+
+def start_routing_encoder_warm_up():
+    """Load the optional routing embedding model in the background after startup."""
+    global _routing_warm_up_task
+    if not HAS_SENTENCE_TRANSFORMERS:
+        logger.info("sentence-transformers not installed, embedding routing disabled")
+        return
+    if _routing_warm_up_task is None or _routing_warm_up_task.done():
+        _routing_warm_up_task = asyncio.create_task(_warm_up_routing_encoder())
+
+
+async def _warm_up_routing_encoder():
+    """Load the routing encoder off the event loop; routing skips the embedding tier until it is ready."""
+    try:
+        await asyncio.to_thread(_load_routing_encoder)
+        logger.info(f"Routing embedding model loaded: {ROUTING_EMBEDDING_MODEL}")
+    except Exception as e:
+        logger.warning(f"Failed to load routing embedding model, embedding routing disabled: {str(e)}")
+
+
+def _classify_by_embedding(query: str) -> Optional[str]:
+    """Compare the query embedding against per-agent exemplar centroids (encoder must be loaded)."""
+    embedding = _routing_encoder.encode(query, normalize_embeddings=True)
+    scores = {
+        agent_kind: float(np.dot(embedding, centroid))
+        for agent_kind, centroid in _routing_centroids.items()
+    }
+    best, runner_up = sorted(scores, key=scores.get, reverse=True)[:2]
+    
+    if scores[best] - scores[runner_up] > ROUTING_EMBEDDING_MARGIN:
+        return best
+    return None
+
+
+async def _classify_by_llm(query: str) -> Optional[str]:
+    """Ask a small, cheap LLM to classify the query."""
+    global _routing_llm
+    
+    if _routing_llm is None:
+        _routing_llm = ChatOpenAI(
+            model=os.getenv("OPENAI_MODEL_ROUTER", "gpt-4o-mini"),
+            temperature=0,
+            max_tokens=5,
+            timeout=10,
+            max_retries=1,
+            api_key=os.getenv("OPENAI_API_KEY")
+        )
+    
+    try:
+        reply = await _routing_llm.ainvoke(ROUTING_PROMPT.format(query=query))
+    except Exception as e:
+        logger.warning(f"LLM routing failed: {str(e)}")
+        return None
+    
+    answer = reply.content.strip().strip(".").lower()
+    return answer if answer in ("data", "analysis") else None
+
+
+def _to_agent_response(result, agent_name: str, include_trace: bool = False) -> AgentResponse:
+    """
+    Convert an agent result into an AgentResponse.
+    
+    The reasoning trace and tools used are cached under a random token and
+    exposed through URLs carrying that token unless the caller asks for them
+    inline.
+    """
+    token = uuid.uuid4().hex
+    _task_traces[token] = {
+        "task_id": result.task_id,
+        "reasoning_trace": result.reasoning_trace,
+        "tools_used": result.tools_used
+    }
+    
+    # Agent results are already typed, so skip re-validating them
+    return AgentResponse.model_construct(
+        success=result.success,
+        task_id=result.task_id,
+        agent_name=agent_name,
+        result=result.result,
+        reasoning_trace=result.reasoning_trace if include_trace else None,
+        tools_used=result.tools_used if include_trace else None,
+        trace_url=f"{llm_router.prefix}/task/{result.task_id}/trace?token={token}",
+        tools_url=f"{llm_router.prefix}/task/{result.task_id}/tools?token={token}",
+        execution_time_ms=result.execution_time_ms,
+        confidence_score=result.confidence_score,
+        error_message=result.error_message,
+        metadata=result.metadata
+    )
+
+
+def _exceeds_stream_threshold(results: Dict[str, Any]) -> bool:
+    """
+    Check whether workflow results are large enough to stream, without encoding them.
+    
+    Only the bulky parts of each step (result and reasoning trace) are
+    measured, structurally, and the walk stops once the threshold is passed.
+    """
+    step_results = results.get("step_results")
+    if not isinstance(step_results, dict):
+        return False
+    
+    size = 0
+    for step_result in step_results.values():
+        if not isinstance(step_result, dict):
+            continue
+        size += _estimate_size(step_result.get("result"), WORKFLOW_STREAM_THRESHOLD_BYTES - size)
+        size += _estimate_size(step_result.get("reasoning_trace"), WORKFLOW_STREAM_THRESHOLD_BYTES - size)
+        if size > WORKFLOW_STREAM_THRESHOLD_BYTES:
+            return True
+    return False
+
+
+def _estimate_size(value: Any, budget: int) -> int:
+    """Approximate the JSON size of a value from its strings and containers, stopping past budget."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        value = itertools.chain.from_iterable(value.items())
+    elif not isinstance(value, (list, tuple)):
+        return 8  # Numbers, booleans, None and other scalars
+    
+    size = 2
+    for item in value:
+        size += _estimate_size(item, budget - size) + 1
+        if size > budget:
+            break
+    return size
+
+
+def _encode_workflow_results(results: Dict[str, Any]):
+    """
+    Lazily encode workflow results as JSON fragments of a single object body.
+    
+    Each entry of ``step_results`` is encoded only when its fragment is
+    requested, so large workflows are streamed one step at a time.
+    """
+    for index, (key, value) in enumerate(results.items()):
+        prefix = (b"," if index else b"") + orjson.dumps(key) + b":"
+        if key == "step_results" and isinstance(value, dict):
+            yield prefix + b"{"
+            for step_index, (step_id, step_result) in enumerate(value.items()):
+                yield (
+                    (b"," if step_index else b"")
+                    + orjson.dumps(step_id) + b":"
+                    + orjson.dumps(step_result, default=str)
+                )
+            yield b"}"
+        else:
+            yield prefix + orjson.dumps(value, default=str)
+
+
+def _stream_workflow_response(response: WorkflowResponse):
+    """Yield a WorkflowResponse as JSON: envelope first, then each results fragment."""
+    envelope = orjson.dumps(response.model_dump(exclude={"results"}), default=str)
+    yield envelope[:-1] + b',"results":{'
+    yield from _encode_workflow_results(response.results)
+    yield b"}}"
+
+
+def start_notification_consumer():
+    """Start the background consumer that dispatches queued notifications."""
+    global _notification_consumer_task
+    if _notification_consumer_task is None or _notification_consumer_task.done():
+        _notification_consumer_task = asyncio.create_task(_notification_consumer())
+
+
+async def stop_notification_consumer():
+    """Deliver queued notifications (bounded wait), then cancel the consumer task."""
+    global _notification_consumer_task
+    if _notification_consumer_task is not None:
+        if not _notification_consumer_task.done():
+            try:
+                await asyncio.wait_for(
+                    _notification_queue.join(),
+                    timeout=NOTIFICATION_DRAIN_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Dropping {_notification_queue.qsize()} queued notifications on shutdown"
+                )
+        _notification_consumer_task.cancel()
+        try:
+            await _notification_consumer_task
+        except asyncio.CancelledError:
+            pass
+        _notification_consumer_task = None
+
+
+async def _notification_consumer():
+    """Drain the notification queue, dispatching completed workflows in small batches."""
+    while True:
+        batch = [await _notification_queue.get()]
+        
+        # Collect whatever else arrives within the batch window
+        try:
+            while len(batch) < NOTIFICATION_BATCH_SIZE:
+                batch.append(await asyncio.wait_for(
+                    _notification_queue.get(),
+                    timeout=NOTIFICATION_BATCH_WINDOW_SECONDS
+                ))
+        except asyncio.TimeoutError:
+            pass
+        
+        for workflow_result in batch:
+            await _send_workflow_completion_notification(workflow_result)
+            _notification_queue.task_done()
 
 
 async def _send_workflow_completion_notification(workflow_result: Dict[str, Any]):
-    """Send notification when workflow completes (background task)."""
+    """Send notification when workflow completes."""
     try:
         # This could integrate with Slack, email, or other notification systems
         logger.info(f"Workflow {workflow_result['workflow_id']} completed - notification sent")
@@ -445,9 +927,12 @@ async def _send_workflow_completion_notification(workflow_result: Dict[str, Any]
 
 
 # Streaming response support (for future implementation)
-@llm_router.post("/execute/stream")
+@llm_router.post(
+    "/execute/stream",
+    openapi_extra=_json_body_openapi(NaturalLanguageRequest)
+)
 async def execute_streaming_task(
-    request: NaturalLanguageRequest,
+    request: NaturalLanguageRequest = Depends(_json_body(NaturalLanguageRequest)),
     agents = Depends(get_agents)
 ):
     """
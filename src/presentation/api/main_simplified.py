@@ -5,15 +5,26 @@ FastAPI application using the simplified Agent-Tool architecture with
 unified repository pattern and direct OpenAI integration.
 """
 import os
+import asyncio
+import functools
+import hashlib
 import logging
+import uuid
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from cachetools import TTLCache
 
 # Infrastructure setup - simplified for LLM-only architecture
 from ...application.agents.llm_data_agent import LLMDataAgent
 from ...application.agents.llm_analysis_agent import LLMAnalysisAgent
+from ...application.tools.rss_news_fetcher import shutdown_executors as shutdown_rss_executors
+from ...infrastructure.database.simple_pg_db import get_simple_db, ensure_tables
 
 # Configure logging
 logging.basicConfig(
@@ -35,25 +46,92 @@ An intelligent investment research automation tool using:
 - Direct OpenAI integration for AI analysis
 """
 
+# Maximum concurrent per-article analysis requests
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "20"))
+
+# Successful sentiment analyses keyed by sha256 of depth and content
+_analysis_cache = TTLCache(maxsize=256, ttl=3600)
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+_MISSING = object()
+
+
+def _cached_response(ttl: int, maxsize: int = 128, cacheable=None):
+    """
+    Cache an endpoint's responses for ttl seconds, keyed on its query arguments.
+    
+    If cacheable is given, only responses for which it returns True are stored.
+    """
+    def decorator(func):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = tuple(sorted(kwargs.items()))
+            response = cache.get(key, _MISSING)
+            if response is not _MISSING:
+                return response
+            response = await func(**kwargs)
+            if cacheable is None or cacheable(response):
+                cache[key] = response
+            return response
+        
+        return wrapper
+    return decorator
+
+
+# Recent DataAgent health check result, reused by frequent /health probes
+_data_health_cache = TTLCache(maxsize=1, ttl=5)
+
 # Global components - simplified LLM agents
 data_agent = None
 analysis_agent = None
+data_db_tool = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
-    global data_agent, analysis_agent
+    global data_agent, analysis_agent, data_db_tool
     
     # Startup
     logger.info("🚀 Starting AI Invest Trend API v2.1 (LLM-Simplified)...")
+    app.state.started_at = _utc_now_iso()
     
     try:
         # Create LLM agents (simplified - no database dependency)
         data_agent = LLMDataAgent()
         analysis_agent = LLMAnalysisAgent()
+        app.state.analysis_capabilities = analysis_agent.get_capabilities()
+        app.state.db = get_simple_db()
+        
+        # Resolve DataAgent's database tool once for fallback reads
+        data_db_tool = next(
+            (tool for tool in data_agent.tools if 'database' in tool.name.lower()),
+            None
+        )
         logger.info("✅ LLM Agents initialized (DataAgent, AnalysisAgent)")
         
+        # Create database tables once; stored-news retries if this fails
+        try:
+            await ensure_tables()
+            app.state.tables_ready = True
+            logger.info("✅ Database tables ready")
+        except Exception as e:
+            app.state.tables_ready = False
+            logger.warning(f"⚠️ Database table initialization failed: {e}")
+        
+        # Start workflow notification consumer
+        start_notification_consumer()
+        
+        # Load the optional query routing embedding model without blocking startup
+        start_routing_encoder_warm_up()
+        
         logger.info("✅ System ready - skipping health check to avoid LLM loops")
         
         # Log configuration
@@ -70,6 +148,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 Shutting down AI Invest Trend API...")
+    await stop_notification_consumer()
+    await shutdown_rss_executors()
     logger.info("✅ Application shutdown completed")
 
 
@@ -78,7 +158,8 @@ app = FastAPI(
     title=APP_NAME,
     version=APP_VERSION,
     description=APP_DESCRIPTION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -91,12 +172,15 @@ app.add_middleware(
 )
 
 # Include LLM API router
-from .llm_api_router import llm_router
+from .llm_api_router import (
+    llm_router, start_notification_consumer, stop_notification_consumer, start_routing_encoder_warm_up
+)
 app.include_router(llm_router)
 
 # API Endpoints
 
 @app.get("/")
+@_cached_response(ttl=60)
 async def root():
     """Root endpoint."""
     return {
@@ -116,10 +200,13 @@ async def health_check():
             raise HTTPException(status_code=503, detail="Agents not initialized")
         
         # Check both agents
-        data_health = await data_agent.health_check()
+        data_health = _data_health_cache.get("data_agent")
+        if data_health is None:
+            data_health = await data_agent.health_check()
+            _data_health_cache["data_agent"] = data_health
         analysis_health = {
             "healthy": True,
-            "available_capabilities": analysis_agent.get_capabilities()
+            "available_capabilities": app.state.analysis_capabilities
         }
         
         overall_healthy = data_health.get("overall_healthy", False)
@@ -132,7 +219,8 @@ async def health_check():
                 "error": None if data_health.get("overall_healthy", False) else "Data agent health check failed"
             },
             "analysis_agent": analysis_health,
-            "timestamp": "2025-08-29T07:00:00Z"  # Will be updated with actual time
+            "started_at": app.state.started_at,
+            "timestamp": _utc_now_iso()
         }
         
     except Exception as e:
@@ -141,6 +229,7 @@ async def health_check():
 
 
 @app.get("/agents/info")
+@_cached_response(ttl=60)
 async def agents_info():
     """Get information about available agents."""
     try:
@@ -173,6 +262,7 @@ async def run_full_analysis(
     4. Report generation (optional)
     5. Notifications (optional)
     """
+    started_at = _utc_now_iso()
     try:
         if not data_agent or not analysis_agent:
             raise HTTPException(status_code=503, detail="LLM Agents not initialized")
@@ -186,8 +276,8 @@ async def run_full_analysis(
         )
         
         workflow_result = {
-            "workflow_id": f"{hash(str(max_articles))%10000}",
-            "started_at": "2025-08-29T07:00:00Z",
+            "workflow_id": uuid.uuid4().hex[:8],
+            "started_at": started_at,
             "steps": {
                 "fetch_news": {
                     "success": fetch_result.success,
@@ -202,17 +292,47 @@ async def run_full_analysis(
         if fetch_result.success and fetch_result.result:
             articles_data = fetch_result.result.get("articles", [])
             if articles_data:
-                # Simulate batch analysis
-                analysis_result = await analysis_agent.batch_analyze_news(
-                    articles=articles_data,
-                    analysis_types=["sentiment", "topics", "stocks"]
+                # Analyze articles concurrently, bounded by the rate limit.
+                # Note: concurrent runs share the agent's conversation memory,
+                # so chat history may interleave across articles.
+                analysis_types = ["sentiment", "topics", "stocks"]
+                semaphore = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+                
+                async def analyze_article(article):
+                    async with semaphore:
+                        return await analysis_agent.batch_analyze_news(
+                            articles=[article],
+                            analysis_types=analysis_types
+                        )
+                
+                results = await asyncio.gather(
+                    *map(analyze_article, articles_data),
+                    return_exceptions=True
                 )
                 
+                analyses = []
+                errors = []
+                tools_used = {}
+                for index, result in enumerate(results):
+                    if isinstance(result, Exception):
+                        errors.append(str(result))
+                    elif not result.success:
+                        errors.append(result.error_message)
+                    else:
+                        analyses.append({"article_index": index, "analysis": result.result})
+                        tools_used.update(dict.fromkeys(result.tools_used or []))
+                
+                # Succeed if any article was analyzed; flag partial failures
                 workflow_result["steps"]["batch_analysis"] = {
-                    "success": analysis_result.success,
-                    "data": analysis_result.result if analysis_result.success else None,
-                    "error": analysis_result.error_message,
-                    "tools_used": analysis_result.tools_used
+                    "success": bool(analyses),
+                    "partial": bool(analyses and errors),
+                    "data": {
+                        "analyses": analyses,
+                        "succeeded": len(analyses),
+                        "failed": len(errors)
+                    },
+                    "error": errors[0] if errors else None,
+                    "tools_used": list(tools_used)
                 }
             else:
                 workflow_result["steps"]["batch_analysis"] = {
@@ -229,22 +349,21 @@ async def run_full_analysis(
                 "tools_used": []
             }
         
-        # Determine overall status
-        all_success = all(
-            step.get("success", False) 
-            for step in workflow_result["steps"].values()
-        )
+        # Determine overall status and the first error in a single pass
+        all_success = True
+        first_error = None
+        for step in workflow_result["steps"].values():
+            if not step.get("success", False):
+                all_success = False
+                if step.get("error"):
+                    first_error = step["error"]
+                    break
         
         workflow_result["status"] = "completed" if all_success else "error"
-        workflow_result["completed_at"] = "2025-08-29T07:01:00Z"
+        workflow_result["partial"] = any(step.get("partial", False) for step in workflow_result["steps"].values())
+        workflow_result["completed_at"] = _utc_now_iso()
         
         if not all_success:
-            # Find the first error for the main error field
-            first_error = None
-            for step in workflow_result["steps"].values():
-                if not step.get("success", False) and step.get("error"):
-                    first_error = step["error"]
-                    break
             workflow_result["error"] = first_error or "Unknown workflow error"
         
         return workflow_result
@@ -252,23 +371,26 @@ async def run_full_analysis(
     except Exception as e:
         logger.error(f"LLM analysis workflow failed: {e}")
         return {
-            "workflow_id": f"error_{hash(str(e))%10000}",
-            "started_at": "2025-08-29T07:00:00Z",
+            "workflow_id": f"error_{uuid.uuid4().hex[:8]}",
+            "started_at": started_at,
             "status": "error",
             "error": str(e),
-            "completed_at": "2025-08-29T07:00:01Z"
+            "completed_at": _utc_now_iso()
         }
 
 
 @app.post("/run/analyze-existing")
 async def analyze_existing_news(
     days_back: int = 7,
-    limit: int = 50
+    limit: int = 50,
+    batch_mode: bool = False
 ):
     """
     Analyze existing content using LLM agents.
     
-    Demonstrates LLM analysis capabilities on sample content.
+    Demonstrates LLM analysis capabilities on sample content. With batch_mode
+    the analysis is submitted to the OpenAI Batch API and the batch ID is
+    returned for polling via /batches/{batch_id}.
     """
     try:
         if not analysis_agent:
@@ -284,11 +406,31 @@ async def analyze_existing_news(
         after-hours trading.
         """
         
-        # Run analysis using LLM agent
-        analysis_result = await analysis_agent.analyze_sentiment(
-            content=sample_content,
-            analysis_depth="comprehensive"
-        )
+        if batch_mode:
+            batch_id = await analysis_agent.submit_sentiment_batch(
+                contents={"sample_content": sample_content},
+                analysis_depth="comprehensive"
+            )
+            return {
+                "success": True,
+                "analysis_type": "sample_content_analysis",
+                "days_back": days_back,
+                "limit": limit,
+                "batch_id": batch_id,
+                "status_url": f"/batches/{batch_id}"
+            }
+        
+        # Run analysis using LLM agent, reusing a cached result when available
+        analysis_depth = "comprehensive"
+        cache_key = hashlib.sha256(f"{analysis_depth}|{sample_content}".encode()).hexdigest()
+        analysis_result = _analysis_cache.get(cache_key)
+        if analysis_result is None:
+            analysis_result = await analysis_agent.analyze_sentiment(
+                content=sample_content,
+                analysis_depth=analysis_depth
+            )
+            if analysis_result.success:
+                _analysis_cache[cache_key] = analysis_result
         
         return {
             "success": analysis_result.success,
@@ -308,7 +450,57 @@ async def analyze_existing_news(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/batches/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """Get the status and results of an analysis batch job."""
+    try:
+        if not analysis_agent:
+            raise HTTPException(status_code=503, detail="Analysis agent not initialized")
+        
+        batch_result = await analysis_agent.get_batch_results(batch_id)
+        if batch_result is None:
+            raise HTTPException(status_code=404, detail=f"Batch '{batch_id}' not found")
+        return batch_result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get batch {batch_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@dataclass(slots=True)
+class FormattedArticle:
+    """Freshly fetched article as returned by /data/recent-news."""
+    id: str
+    title: str
+    url: str
+    source: str
+    author: str
+    published_at: Optional[Any]
+    content_preview: str
+    processing_status: str
+    created_at: Optional[Any]
+
+
+def _format_fetched_article(article: dict) -> FormattedArticle:
+    """Format a freshly fetched article for API responses."""
+    content = article.get('content')
+    return FormattedArticle(
+        id=article.get('content_hash', 'unknown'),  # Use hash as ID
+        title=article.get('title', ''),
+        url=article.get('url', ''),
+        source=article.get('source', ''),
+        author=article.get('author', ''),
+        published_at=article.get('published_at'),
+        content_preview=f"{content[:200]}..." if content else "",
+        processing_status="completed",
+        created_at=article.get('fetched_at')
+    )
+
+
 @app.get("/data/recent-news")
+@_cached_response(ttl=300, cacheable=lambda response: "warning" not in response)
 async def get_recent_news(days: int = 7, limit: int = 20):
     """Get recent news articles using real DataAgent."""
     try:
@@ -331,19 +523,7 @@ async def get_recent_news(days: int = 7, limit: int = 20):
             articles_data = result_data.get('articles', [])
             
             # Format articles for API response
-            formatted_articles = []
-            for article in articles_data:
-                formatted_articles.append({
-                    "id": article.get('content_hash', 'unknown'),  # Use hash as ID
-                    "title": article.get('title', ''),
-                    "url": article.get('url', ''),
-                    "source": article.get('source', ''),
-                    "author": article.get('author', ''),
-                    "published_at": article.get('published_at'),
-                    "content_preview": article.get('content', '')[:200] + "..." if article.get('content') else "",
-                    "processing_status": "completed",
-                    "created_at": article.get('fetched_at')
-                })
+            formatted_articles = [_format_fetched_article(article) for article in articles_data]
             
             return {
                 "success": True,
@@ -366,11 +546,7 @@ async def get_recent_news(days: int = 7, limit: int = 20):
             logger.warning(f"Fresh fetch failed: {fetch_result.error_message}, trying stored data")
             
             # Try to use database tool directly to get recent articles
-            db_tool = None
-            for tool in data_agent.tools:
-                if 'database' in tool.name.lower():
-                    db_tool = tool
-                    break
+            db_tool = data_db_tool
             
             if db_tool:
                 db_result = await db_tool.execute(
@@ -382,16 +558,17 @@ async def get_recent_news(days: int = 7, limit: int = 20):
                 if db_result.is_success:
                     stored_articles = db_result.data.get('articles', [])
                     
-                    formatted_articles = []
-                    for article in stored_articles:
-                        formatted_articles.append({
+                    formatted_articles = [
+                        {
                             "id": str(article.get('id', 'unknown')),
                             "title": article.get('title', ''),
                             "url": article.get('url', ''),
                             "source": article.get('source', ''),
                             "processing_status": article.get('processing_status', 'unknown'),
                             "created_at": article.get('created_at')
-                        })
+                        }
+                        for article in stored_articles
+                    ]
                     
                     return {
                         "success": True,
@@ -417,6 +594,7 @@ async def get_recent_news(days: int = 7, limit: int = 20):
 
 
 @app.get("/data/recent-analysis")
+@_cached_response(ttl=60)
 async def get_recent_analysis(days: int = 7, limit: int = 20):
     """Get recent analysis results (mock data for LLM demo)."""
     try:
@@ -464,16 +642,13 @@ async def get_stored_news(
     try:
         logger.info(f"Querying stored news: {days} days, limit {limit}, include_content={include_content}")
         
-        # Use SimplePGDB directly
-        from ...infrastructure.database.simple_pg_db import get_simple_db, ensure_tables
-        
-        # Ensure tables exist
-        await ensure_tables()
-        
-        db = get_simple_db()
+        # Ensure tables exist if startup initialization failed
+        if not app.state.tables_ready:
+            await ensure_tables()
+            app.state.tables_ready = True
         
         # Query stored news directly from simplified database
-        result = await db.find_recent_news(
+        result = await app.state.db.find_recent_news(
             days=days,
             limit=limit,
             include_content=include_content